@@ -6,9 +6,13 @@ import os
 import time
 from datetime import datetime
 import logging
+from request_logging import configure_logging, get_logging_stats
+from utils import FEATURE_NAMES, get_crop_ranges, suitability_scores, blend_scores
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 1.0))
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+configure_logging(level=logging.INFO, sample_rate=LOG_SAMPLE_RATE, queue_size=LOG_QUEUE_SIZE)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
@@ -18,29 +22,44 @@ CORS(app)
 MODEL_PATH = os.path.join(os.path.dirname(__file__), 'model', 'crop_model.pkl')
 PORT = int(os.environ.get('PORT', 5001))
 DEBUG = os.environ.get('DEBUG', 'False').lower() == 'true'
+SUITABILITY_WEIGHT = float(os.environ.get('SUITABILITY_WEIGHT', 0.3))
 
 # Global variables
-model = None
+model_state = None  # (model, crop_ranges), always replaced together
 model_loaded = False
 model_version = "1.0.0"
 
+def build_model_state(model):
+    """Pair a model with its crop optimal ranges aligned to the model classes"""
+    crop_ranges = get_crop_ranges(model.classes_) if hasattr(model, 'classes_') else None
+    return (model, crop_ranges)
+
 def load_model():
     """Load the trained ML model"""
-    global model, model_loaded
+    global model_state, model_loaded
     try:
         if os.path.exists(MODEL_PATH):
             with open(MODEL_PATH, 'rb') as f:
-                model = pickle.load(f)
+                new_state = build_model_state(pickle.load(f))
+            # Publish model and ranges in one assignment so a concurrent
+            # prediction never sees the new model with the old ranges
+            model_state = new_state
             model_loaded = True
-            logger.info(f"Model loaded successfully from {MODEL_PATH}")
+            logger.info("Model loaded successfully from %s", MODEL_PATH)
             return True
         else:
-            logger.warning(f"Model file not found at {MODEL_PATH}")
+            logger.warning("Model file not found at %s", MODEL_PATH)
             return False
     except Exception as e:
-        logger.error(f"Error loading model: {str(e)}")
+        logger.error("Error loading model: %s", e)
         return False
 
+def _score_or_none(scores, idx):
+    """Convert a suitability score to a JSON-safe value"""
+    if scores is None or idx is None or np.isnan(scores[idx]):
+        return None
+    return round(float(scores[idx]), 4)
+
 def predict_crop(features):
     """
     Make crop prediction using the loaded model
@@ -54,10 +73,12 @@ def predict_crop(features):
     if not model_loaded:
         raise Exception("Model not loaded")
     
+    # Read a single snapshot so a concurrent reload cannot mix model and ranges
+    model, crop_ranges = model_state
+    
     try:
         # Extract features in the correct order
-        feature_names = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
-        feature_values = [features[name] for name in feature_names]
+        feature_values = [features[name] for name in FEATURE_NAMES]
         
         # Convert to numpy array and reshape
         X = np.array(feature_values).reshape(1, -1)
@@ -78,9 +99,18 @@ def predict_crop(features):
             else:
                 confidence = "Low"
         except:
+            probabilities = None
             confidence_score = 0.85
             confidence = "High"
         
+        # Score the input against every crop's optimal ranges
+        suitability = None
+        blended = None
+        if crop_ranges is not None:
+            suitability = suitability_scores(X, *crop_ranges)[0]
+            if probabilities is not None:
+                blended = blend_scores(probabilities, suitability, SUITABILITY_WEIGHT)
+        
         # Get alternative crops if possible
         alternative_crops = []
         try:
@@ -94,23 +124,41 @@ def predict_crop(features):
                     alternative_crops.append({
                         "crop": crop_classes[idx],
                         "confidence": alt_confidence,
-                        "confidence_score": float(probabilities[idx])
+                        "confidence_score": float(probabilities[idx]),
+                        "suitability_score": _score_or_none(suitability, idx)
                     })
         except:
             pass
         
+        # Rank crops by blended model probability and suitability
+        suitability_ranking = []
+        if blended is not None:
+            for idx in np.argsort(blended)[-3:][::-1]:
+                suitability_ranking.append({
+                    "crop": model.classes_[idx],
+                    "suitability_score": _score_or_none(suitability, idx),
+                    "blended_score": round(float(blended[idx]), 4)
+                })
+        
+        predicted_idx = None
+        if suitability is not None:
+            matches = np.flatnonzero(model.classes_ == prediction)
+            predicted_idx = matches[0] if len(matches) else None
+        
         return {
             "crop": prediction,
             "confidence": confidence,
             "confidence_score": float(confidence_score),
             "alternative_crops": alternative_crops,
+            "suitability_score": _score_or_none(suitability, predicted_idx),
+            "suitability_ranking": suitability_ranking,
             "reasoning": f"Based on soil analysis: N={features['N']}, P={features['P']}, K={features['K']}, pH={features['ph']}, and climate conditions: temperature={features['temperature']}°C, humidity={features['humidity']}%, rainfall={features['rainfall']}mm",
             "model_version": model_version,
             "timestamp": datetime.now().isoformat()
         }
         
     except Exception as e:
-        logger.error(f"Prediction error: {str(e)}")
+        logger.error("Prediction error: %s", e)
         raise Exception(f"Prediction failed: {str(e)}")
 
 @app.route('/health', methods=['GET'])
@@ -132,6 +180,7 @@ def status():
         "version": model_version,
         "model_loaded": model_loaded,
         "model_path": MODEL_PATH,
+        "logging": get_logging_stats(),
         "timestamp": datetime.now().isoformat()
     })
 
@@ -148,7 +197,7 @@ def predict():
         data = request.get_json()
         
         # Validate required fields
-        required_fields = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
+        required_fields = FEATURE_NAMES
         missing_fields = [field for field in required_fields if field not in data]
         
         if missing_fields:
@@ -220,12 +269,25 @@ def predict():
         # Add processing time to result
         result["processing_time_ms"] = round(processing_time, 2)
         
-        logger.info(f"Prediction successful: {result['crop']} (confidence: {result['confidence']})")
+        logger.info("Prediction successful", extra={
+            "sample": True,
+            "fields": {
+                "event": "prediction",
+                "crop": result["crop"],
+                "confidence": result["confidence"],
+                "processing_time_ms": result["processing_time_ms"]
+            }
+        })
         return jsonify(result)
         
     except Exception as e:
         processing_time = (time.time() - start_time) * 1000
-        logger.error(f"Prediction failed: {str(e)}")
+        logger.error("Prediction failed: %s", e, extra={
+            "fields": {
+                "event": "prediction_error",
+                "processing_time_ms": round(processing_time, 2)
+            }
+        })
         
         return jsonify({
             "error": str(e),
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Logging benchmark for the Crop Recommendation ML Service
+This script measures /predict throughput with request logging off,
+synchronous, and queue-backed asynchronous
+"""
+
+import argparse
+import logging
+import tempfile
+import threading
+import time
+
+import app as ml_app
+from request_logging import JsonFormatter, configure_logging, get_logging_stats, shutdown_logging
+from utils import create_dummy_model
+
+TEST_DATA = {
+    "N": 80,
+    "P": 40,
+    "K": 30,
+    "temperature": 25,
+    "humidity": 70,
+    "ph": 6.5,
+    "rainfall": 150
+}
+
+
+def setup_model():
+    """Install a dummy model so the benchmark does not need a trained one"""
+    model = create_dummy_model()
+    if model is None:
+        return False
+    ml_app.model_state = ml_app.build_model_state(model)
+    ml_app.model_loaded = True
+    return True
+
+
+def use_logging(mode, stream, sample_rate):
+    """Switch the root logger to the given mode"""
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    logging.disable(logging.NOTSET)
+
+    if mode == "off":
+        logging.disable(logging.CRITICAL)
+    elif mode == "sync":
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+    elif mode == "async":
+        configure_logging(level=logging.INFO, sample_rate=sample_rate, stream=stream)
+
+
+def run_requests(requests_per_thread, threads):
+    """Fire prediction requests concurrently and return requests per second"""
+    errors = []
+
+    def worker():
+        client = ml_app.app.test_client()
+        for _ in range(requests_per_thread):
+            response = client.post("/predict", json=TEST_DATA)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if errors:
+        print(f"   ⚠️  {len(errors)} requests failed")
+    return (requests_per_thread * threads) / elapsed
+
+
+def main():
+    """Run the benchmark for each logging mode"""
+    parser = argparse.ArgumentParser(description="Benchmark /predict throughput with logging on and off")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per thread")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent client threads")
+    parser.add_argument("--sample-rate", type=float, default=1.0, help="Success log sample rate for async mode")
+    args = parser.parse_args()
+
+    print("🌾 Crop Recommendation ML Service - Logging Benchmark")
+    print("=" * 50)
+
+    if not setup_model():
+        print("❌ Could not create a model for benchmarking.")
+        return
+
+    # Warm up the model and Flask before measuring
+    use_logging("off", None, 1.0)
+    run_requests(10, 1)
+
+    results = {}
+    with tempfile.TemporaryFile(mode="w") as stream:
+        for mode in ["off", "sync", "async"]:
+            use_logging(mode, stream, args.sample_rate)
+            results[mode] = run_requests(args.requests, args.threads)
+            stats = get_logging_stats()
+            print(f"🔍 {mode:>5}: {results[mode]:8.1f} req/s")
+            if stats["enabled"]:
+                print(f"   enqueued={stats['enqueued']} dropped={stats['dropped']} sampled_out={stats['sampled_out']}")
+        use_logging("off", None, 1.0)
+
+    print("\n" + "=" * 50)
+    print(f"📊 async vs off:  {results['async'] / results['off'] * 100:.1f}% of baseline throughput")
+    print(f"📊 sync vs off:   {results['sync'] / results['off'] * 100:.1f}% of baseline throughput")
+
+
+if __name__ == "__main__":
+    main()
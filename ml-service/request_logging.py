@@ -0,0 +1,194 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+
+
+class JsonFormatter(logging.Formatter):
+    """Render log records as single-line JSON objects"""
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        # Caller fields never overwrite the core keys
+        for key, value in (getattr(record, "fields", None) or {}).items():
+            entry.setdefault(key, value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of records flagged as sampled
+
+    Records are sampled only when logged with ``extra={"sample": True}`` and
+    a level below WARNING, so warnings and errors are always kept.
+    """
+
+    def __init__(self, sample_rate=1.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.sampled_out = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.sample_rate >= 1.0 or record.levelno >= logging.WARNING:
+            return True
+        if not getattr(record, "sample", False):
+            return True
+        if random.random() < self.sample_rate:
+            return True
+        with self._lock:
+            self.sampled_out += 1
+        return False
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the calling thread
+
+    The last ``error_reserve`` slots of the buffer are kept for warnings and
+    errors: other records are dropped and counted once the buffer reaches
+    that point. Nothing ever waits for room, so the added latency per log
+    call is bounded by the enqueue itself; warnings and errors that find the
+    buffer completely full are counted separately in ``dropped_errors``.
+    """
+
+    def __init__(self, log_queue, error_reserve=0):
+        super().__init__(log_queue)
+        self.error_reserve = error_reserve
+        self.enqueued = 0
+        self.dropped = 0
+        self.dropped_errors = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record):
+        # Resolve the message now so later mutation of the args cannot change
+        # it; only the JSON serialisation is left to the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        is_error = record.levelno >= logging.WARNING
+        accepted = is_error or self.queue.qsize() < self.queue.maxsize - self.error_reserve
+        if accepted:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                accepted = False
+        with self._lock:
+            if accepted:
+                self.enqueued += 1
+            elif is_error:
+                self.dropped_errors += 1
+            else:
+                self.dropped += 1
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """Queue listener whose stop waits for room instead of failing on a full buffer"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+_handler = None
+_listener = None
+_sampler = None
+
+
+def configure_logging(level=logging.INFO, sample_rate=1.0, queue_size=10000, stream=None):
+    """
+    Route root logging through a bounded queue to a background JSON writer
+
+    Werkzeug's per-request access lines are raised to WARNING so they do not
+    bypass sampling or compete with prediction logs for the buffer. A tenth
+    of the buffer is reserved for warnings and errors.
+
+    Args:
+        level (int): Root log level
+        sample_rate (float): Fraction of sampled (success) records to keep
+        queue_size (int): Maximum number of buffered records before dropping
+        stream: Output stream for the writer, defaults to stderr
+
+    Returns:
+        BoundedQueueHandler: The handler installed on the root logger
+    """
+    global _handler, _listener, _sampler
+    if queue_size < 1:
+        raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+    if not 0.0 <= sample_rate <= 1.0:
+        raise ValueError(f"sample_rate must be between 0 and 1, got {sample_rate}")
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter())
+
+    _sampler = SamplingFilter(sample_rate)
+    _handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size), queue_size // 10)
+    _handler.addFilter(_sampler)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(level)
+    logging.getLogger("werkzeug").setLevel(max(level, logging.WARNING))
+
+    _listener = _FlushingQueueListener(_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    return _handler
+
+
+def shutdown_logging():
+    """Stop the background writer, flushing any buffered records"""
+    global _listener, _handler
+    # Detach the handler first so no record can arrive after the sentinel
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logging_stats():
+    """
+    Get counters for the asynchronous logging pipeline
+
+    Returns:
+        dict: Enqueued, dropped and sampled-out record counts and overflow policy
+    """
+    if _handler is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "queue_size": _handler.queue.maxsize,
+        "queued": _handler.queue.qsize(),
+        "enqueued": _handler.enqueued,
+        "dropped": _handler.dropped,
+        "dropped_errors": _handler.dropped_errors,
+        "error_reserve": _handler.error_reserve,
+        "sampled_out": _sampler.sampled_out,
+        "sample_rate": _sampler.sample_rate,
+    }
+
+
+atexit.register(shutdown_logging)
@@ -5,9 +5,16 @@ This script tests the API endpoints and model functionality
 """
 
 import requests
+import io
 import json
+import logging
 import time
 
+import numpy as np
+
+from request_logging import configure_logging, get_logging_stats, shutdown_logging
+from utils import CROP_NAMES, FEATURE_NAMES, blend_scores, get_crop_ranges, suitability_scores
+
 # Configuration
 BASE_URL = "http://localhost:5001"
 TEST_DATA = {
@@ -48,6 +55,14 @@ def test_status_endpoint():
             print(f"   Service: {data['service']}")
             print(f"   Version: {data['version']}")
             print(f"   Model loaded: {data['model_loaded']}")
+            
+            logging_stats = data.get('logging', {})
+            expected = ['enqueued', 'dropped', 'dropped_errors', 'sampled_out', 'sample_rate']
+            missing = [key for key in expected if key not in logging_stats]
+            if missing:
+                print(f"❌ Status logging counters missing: {', '.join(missing)}")
+                return False
+            print(f"   Logging: enqueued={logging_stats['enqueued']} dropped={logging_stats['dropped']}")
             return True
         else:
             print(f"❌ Status check failed: {response.status_code}")
@@ -77,6 +92,15 @@ def test_prediction_endpoint():
             if 'alternative_crops' in data and data['alternative_crops']:
                 print(f"   Alternative crops: {len(data['alternative_crops'])} found")
             
+            if 'suitability_score' not in data or 'suitability_ranking' not in data:
+                print("❌ Prediction response is missing suitability fields")
+                return False
+            for entry in data['suitability_ranking']:
+                if not {'crop', 'suitability_score', 'blended_score'} <= entry.keys():
+                    print(f"❌ Malformed suitability ranking entry: {entry}")
+                    return False
+            print(f"   Suitability score: {data['suitability_score']}")
+            
             return True
         else:
             print(f"❌ Prediction failed: {response.status_code}")
@@ -116,6 +140,96 @@ def test_invalid_data():
         print(f"❌ Invalid data test error: {e}")
         return False
 
+def test_suitability_scores():
+    """Test suitability scoring against the crop knowledge base"""
+    print("\n🔍 Testing suitability scoring...")
+    crops = ['rice', 'unknowncrop'] + CROP_NAMES
+    lows, highs = get_crop_ranges(crops)
+    
+    # Inside every rice range: temperature 25°C, pH 6.0, rainfall 200mm
+    in_range = dict(TEST_DATA, temperature=25, ph=6.0, rainfall=200)
+    X = np.array([[in_range[name] for name in FEATURE_NAMES]] * 5, dtype=float)
+    scores = suitability_scores(X, lows, highs)
+    
+    if scores.shape != (5, len(crops)):
+        print(f"❌ Suitability scoring: expected shape {(5, len(crops))}, got {scores.shape}")
+        return False
+    if not np.allclose(scores[:, 0], 1.0):
+        print(f"❌ Suitability scoring: in-range rice scored {scores[0, 0]}")
+        return False
+    if not np.isnan(scores[:, 1]).all():
+        print("❌ Suitability scoring: crop without ranges should score NaN")
+        return False
+    if ((scores[:, 2:] < 0) | (scores[:, 2:] > 1)).any():
+        print("❌ Suitability scoring: scores outside [0, 1]")
+        return False
+    
+    probabilities = np.full(len(crops), 1 / len(crops))
+    blended = blend_scores(probabilities, scores[0], 0.3)
+    share = scores[0, 0] / np.nansum(scores[0])
+    if not np.isclose(blended[1], probabilities[1]) or not np.isclose(blended[0], 0.7 * probabilities[0] + 0.3 * share):
+        print(f"❌ Suitability blending: unexpected result {blended[:2]}")
+        return False
+    
+    # A confident model pick must survive several crops that fit perfectly
+    confident = np.array([0.6, 0.0, 0.0, 0.0, 0.0, 0.0, 0.4])
+    fit = np.array([0.0, 1.0, 1.0, 1.0, 1.0, 1.0, 0.0])
+    if np.argmax(blend_scores(confident, fit, 0.3)) != 0:
+        print("❌ Suitability blending: perfectly fitting crops outranked a confident prediction")
+        return False
+    
+    print(f"✅ Suitability scoring: {len(CROP_NAMES)} crops scored")
+    return True
+
+class SlowStream(io.StringIO):
+    """Stream that makes the log writer fall behind"""
+    
+    def write(self, text):
+        time.sleep(0.05)
+        return super().write(text)
+
+def test_logging_pipeline():
+    """Test drop accounting and sampling of the asynchronous logger"""
+    print("\n🔍 Testing logging pipeline...")
+    test_logger = logging.getLogger("test_model")
+    try:
+        # A burst into a one-slot buffer with a slow writer must drop records
+        configure_logging(queue_size=1, stream=SlowStream())
+        for i in range(50):
+            test_logger.info("burst %s", i)
+        burst_dropped = get_logging_stats()['dropped']
+        if burst_dropped == 0:
+            print("❌ Logging pipeline: burst into full buffer dropped nothing")
+            return False
+        
+        # Errors into the full buffer must not block the caller
+        start = time.perf_counter()
+        for i in range(20):
+            test_logger.error("burst error %s", i)
+        blocked = time.perf_counter() - start
+        if blocked > 0.1 or get_logging_stats()['dropped_errors'] == 0:
+            print(f"❌ Logging pipeline: errors blocked for {blocked:.2f}s on a full buffer")
+            return False
+        
+        # Errors must never be sampled out, even with a zero sample rate
+        stream = io.StringIO()
+        configure_logging(sample_rate=0.0, stream=stream)
+        for i in range(10):
+            test_logger.info("sampled %s", i, extra={"sample": True})
+            test_logger.error("error %s", i, extra={"sample": True})
+        stats = get_logging_stats()
+        shutdown_logging()
+        
+        errors = [json.loads(line) for line in stream.getvalue().splitlines()]
+        if stats['sampled_out'] != 10 or len(errors) != 10 or any(e['level'] != 'ERROR' for e in errors):
+            print(f"❌ Logging pipeline: unexpected sampling result {stats}")
+            return False
+        
+        print(f"✅ Logging pipeline: dropped={burst_dropped}, errors kept={len(errors)}")
+        return True
+    finally:
+        shutdown_logging()
+
 def test_model_reload():
     """Test model reload endpoint"""
     print("\n🔍 Testing model reload endpoint...")
@@ -153,6 +267,8 @@ def main():
         test_status_endpoint,
         test_prediction_endpoint,
         test_invalid_data,
+        test_logging_pipeline,
+        test_suitability_scores,
         test_model_reload
     ]
     
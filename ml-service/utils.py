@@ -5,6 +5,9 @@ from sklearn.ensemble import RandomForestClassifier
 import joblib
 import os
 
+# Model input features, in the order the model expects them
+FEATURE_NAMES = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
+
 def create_dummy_model():
     """
     Create a dummy model for testing purposes when no trained model is available.
@@ -107,10 +110,8 @@ def validate_input_data(data):
     Returns:
         tuple: (is_valid, error_message)
     """
-    required_fields = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
-    
     # Check required fields
-    for field in required_fields:
+    for field in FEATURE_NAMES:
         if field not in data:
             return False, f"Missing required field: {field}"
     
@@ -157,8 +158,7 @@ def preprocess_data(data):
     """
     try:
         # Extract features in the correct order
-        feature_names = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
-        feature_values = [float(data[name]) for name in feature_names]
+        feature_values = [float(data[name]) for name in FEATURE_NAMES]
         
         # Convert to numpy array and reshape
         X = np.array(feature_values).reshape(1, -1)
@@ -169,6 +169,216 @@ def preprocess_data(data):
         print(f"Error preprocessing data: {e}")
         return None
 
+# Crop knowledge base: optimal temperature (°C), pH and rainfall (mm) ranges
+CROP_KNOWLEDGE = {
+    'rice': {
+        'description': 'Rice is a cereal grain and the most important staple food for a large part of the world population.',
+        'temperature': (20, 35), 'ph': (5.5, 6.5), 'rainfall': (150, 300),
+        'water_requirement': 'High', 'season': 'Monsoon'
+    },
+    'wheat': {
+        'description': 'Wheat is a cereal grain that is a worldwide staple food.',
+        'temperature': (15, 25), 'ph': (6.0, 7.5), 'rainfall': (50, 110),
+        'water_requirement': 'Medium', 'season': 'Winter'
+    },
+    'maize': {
+        'description': 'Maize, also known as corn, is a cereal grain first domesticated by indigenous peoples in Mexico.',
+        'temperature': (18, 32), 'ph': (5.5, 7.5), 'rainfall': (100, 200),
+        'water_requirement': 'High', 'season': 'Summer'
+    },
+    'chickpea': {
+        'description': 'Chickpea is a drought-tolerant pulse grown in the cool, dry season.',
+        'temperature': (15, 25), 'ph': (6.0, 8.0), 'rainfall': (40, 100),
+        'water_requirement': 'Low', 'season': 'Winter'
+    },
+    'kidneybeans': {
+        'description': 'Kidney beans are a common bean variety valued for their protein-rich seeds.',
+        'temperature': (15, 25), 'ph': (5.5, 6.5), 'rainfall': (60, 150),
+        'water_requirement': 'Medium', 'season': 'Winter'
+    },
+    'pigeonpeas': {
+        'description': 'Pigeon pea is a hardy perennial legume widely grown in semi-arid tropics.',
+        'temperature': (18, 37), 'ph': (4.5, 7.5), 'rainfall': (90, 200),
+        'water_requirement': 'Medium', 'season': 'Monsoon'
+    },
+    'mothbeans': {
+        'description': 'Moth bean is one of the most drought-resistant pulses, suited to arid regions.',
+        'temperature': (24, 32), 'ph': (3.5, 9.5), 'rainfall': (30, 75),
+        'water_requirement': 'Low', 'season': 'Summer'
+    },
+    'mungbean': {
+        'description': 'Mung bean is a short-duration pulse grown for its edible seeds and sprouts.',
+        'temperature': (25, 35), 'ph': (6.2, 7.2), 'rainfall': (35, 60),
+        'water_requirement': 'Low', 'season': 'Summer'
+    },
+    'blackgram': {
+        'description': 'Black gram is a pulse crop rich in protein, grown in warm and humid conditions.',
+        'temperature': (25, 35), 'ph': (6.5, 7.5), 'rainfall': (50, 100),
+        'water_requirement': 'Low', 'season': 'Summer'
+    },
+    'lentil': {
+        'description': 'Lentil is a cool-season pulse with lens-shaped seeds.',
+        'temperature': (18, 30), 'ph': (6.0, 7.5), 'rainfall': (35, 55),
+        'water_requirement': 'Low', 'season': 'Winter'
+    },
+    'pomegranate': {
+        'description': 'Pomegranate is a fruit-bearing shrub that thrives in semi-arid climates.',
+        'temperature': (18, 25), 'ph': (5.5, 7.5), 'rainfall': (100, 120),
+        'water_requirement': 'Medium', 'season': 'Year-round'
+    },
+    'banana': {
+        'description': 'Banana is a tropical fruit crop that needs warmth and plenty of water.',
+        'temperature': (25, 30), 'ph': (5.5, 6.5), 'rainfall': (90, 120),
+        'water_requirement': 'High', 'season': 'Year-round'
+    },
+    'mango': {
+        'description': 'Mango is a tropical fruit tree that prefers a dry period before flowering.',
+        'temperature': (27, 36), 'ph': (4.5, 7.0), 'rainfall': (80, 120),
+        'water_requirement': 'Medium', 'season': 'Summer'
+    },
+    'grapes': {
+        'description': 'Grapes are a vine fruit grown for table use, raisins and wine.',
+        'temperature': (15, 35), 'ph': (5.5, 6.5), 'rainfall': (60, 75),
+        'water_requirement': 'Low', 'season': 'Winter'
+    },
+    'watermelon': {
+        'description': 'Watermelon is a vine-grown fruit that needs warm days and well-drained soil.',
+        'temperature': (22, 30), 'ph': (6.0, 7.0), 'rainfall': (40, 60),
+        'water_requirement': 'Medium', 'season': 'Summer'
+    },
+    'muskmelon': {
+        'description': 'Muskmelon is a sweet melon grown in hot, dry conditions.',
+        'temperature': (25, 32), 'ph': (6.0, 7.0), 'rainfall': (20, 40),
+        'water_requirement': 'Low', 'season': 'Summer'
+    },
+    'apple': {
+        'description': 'Apple is a temperate fruit tree that needs winter chilling.',
+        'temperature': (15, 24), 'ph': (5.5, 6.5), 'rainfall': (100, 125),
+        'water_requirement': 'Medium', 'season': 'Winter'
+    },
+    'orange': {
+        'description': 'Orange is a citrus fruit grown in subtropical climates.',
+        'temperature': (10, 35), 'ph': (6.0, 7.5), 'rainfall': (100, 120),
+        'water_requirement': 'Medium', 'season': 'Winter'
+    },
+    'papaya': {
+        'description': 'Papaya is a fast-growing tropical fruit plant sensitive to frost.',
+        'temperature': (25, 40), 'ph': (6.5, 7.0), 'rainfall': (100, 250),
+        'water_requirement': 'High', 'season': 'Year-round'
+    },
+    'coconut': {
+        'description': 'Coconut is a tropical palm grown for its fruit, oil and fibre.',
+        'temperature': (25, 30), 'ph': (5.5, 6.5), 'rainfall': (130, 225),
+        'water_requirement': 'High', 'season': 'Year-round'
+    },
+    'cotton': {
+        'description': 'Cotton is a soft, fluffy staple fiber that grows in a boll around the seeds of cotton plants.',
+        'temperature': (25, 35), 'ph': (5.5, 8.5), 'rainfall': (60, 100),
+        'water_requirement': 'Medium', 'season': 'Summer'
+    },
+    'jute': {
+        'description': 'Jute is a long, soft fibre crop grown in hot and humid river deltas.',
+        'temperature': (24, 35), 'ph': (6.0, 7.5), 'rainfall': (150, 200),
+        'water_requirement': 'High', 'season': 'Monsoon'
+    },
+    'coffee': {
+        'description': 'Coffee is a shade-loving plantation crop grown for its seeds.',
+        'temperature': (15, 28), 'ph': (6.0, 7.5), 'rainfall': (115, 200),
+        'water_requirement': 'High', 'season': 'Monsoon'
+    }
+}
+
+# Features scored for suitability and their column in the model feature order
+SUITABILITY_FEATURES = ['temperature', 'ph', 'rainfall']
+SUITABILITY_COLUMNS = [FEATURE_NAMES.index(f) for f in SUITABILITY_FEATURES]
+
+CROP_NAMES = list(CROP_KNOWLEDGE)
+_CROP_INDEX = {name: i for i, name in enumerate(CROP_NAMES)}
+_CROP_LOWS = np.array([[CROP_KNOWLEDGE[c][f][0] for f in SUITABILITY_FEATURES] for c in CROP_NAMES], dtype=float)
+_CROP_HIGHS = np.array([[CROP_KNOWLEDGE[c][f][1] for f in SUITABILITY_FEATURES] for c in CROP_NAMES], dtype=float)
+
+def get_crop_ranges(crop_names):
+    """
+    Get optimal ranges aligned with a list of crop names
+    
+    Args:
+        crop_names (list): Crop names, e.g. the model's classes_
+        
+    Returns:
+        tuple: (lows, highs) arrays of shape (n_crops, 3); rows are NaN for unknown crops
+    """
+    lows = np.full((len(crop_names), len(SUITABILITY_FEATURES)), np.nan)
+    highs = np.full((len(crop_names), len(SUITABILITY_FEATURES)), np.nan)
+    for i, name in enumerate(crop_names):
+        idx = _CROP_INDEX.get(str(name).lower())
+        if idx is not None:
+            lows[i] = _CROP_LOWS[idx]
+            highs[i] = _CROP_HIGHS[idx]
+    return lows, highs
+
+def suitability_scores(X, lows, highs):
+    """
+    Score how well each input row fits every crop's optimal ranges
+    
+    A feature inside its range scores 1 and falls off linearly to 0 at one
+    range-width outside it; the crop score is the mean over features.
+    
+    Args:
+        X (numpy.ndarray): Feature matrix of shape (n_samples, 7) in FEATURE_NAMES order
+        lows (numpy.ndarray): Range lower bounds from get_crop_ranges
+        highs (numpy.ndarray): Range upper bounds from get_crop_ranges
+        
+    Returns:
+        numpy.ndarray: Scores in [0, 1] of shape (n_samples, n_crops), NaN for unknown crops
+    """
+    values = np.asarray(X, dtype=float)[:, SUITABILITY_COLUMNS][:, np.newaxis, :]
+    width = np.maximum(highs - lows, 1.0)
+    distance = np.maximum(lows - values, 0) + np.maximum(values - highs, 0)
+    return np.clip(1.0 - distance / width, 0.0, 1.0).mean(axis=2)
+
+def blend_scores(probabilities, suitability, weight):
+    """
+    Blend model probabilities with suitability scores
+    
+    Suitability scores are independent per crop, so they are first
+    normalised into a distribution over crops to match the scale of the
+    probabilities; otherwise every crop whose ranges fit the input would
+    outrank a confident model prediction.
+    
+    Args:
+        probabilities (numpy.ndarray): Model class probabilities
+        suitability (numpy.ndarray): Suitability scores with the same shape
+        weight (float): Share of the blended score given to suitability
+        
+    Returns:
+        numpy.ndarray: Blended scores; crops without ranges keep their probability
+    """
+    total = np.nansum(suitability, axis=-1, keepdims=True)
+    share = np.divide(suitability, total, out=np.zeros_like(suitability), where=total > 0)
+    blended = (1 - weight) * probabilities + weight * share
+    return np.where(np.isnan(suitability), probabilities, blended)
+
+# Display strings for get_crop_info, built once from the numeric ranges
+_CROP_DISPLAY = {
+    name: {
+        'description': info['description'],
+        'optimal_temp': '{:g}-{:g}°C'.format(*info['temperature']),
+        'optimal_ph': '{:.1f}-{:.1f}'.format(*info['ph']),
+        'optimal_rainfall': '{:g}-{:g} mm'.format(*info['rainfall']),
+        'water_requirement': info['water_requirement'],
+        'season': info['season']
+    }
+    for name, info in CROP_KNOWLEDGE.items()
+}
+_UNKNOWN_CROP_DISPLAY = {
+    'description': 'Information not available for this crop.',
+    'optimal_temp': 'N/A',
+    'optimal_ph': 'N/A',
+    'optimal_rainfall': 'N/A',
+    'water_requirement': 'N/A',
+    'season': 'N/A'
+}
+
 def get_crop_info(crop_name):
     """
     Get information about a specific crop
@@ -179,41 +389,4 @@ def get_crop_info(crop_name):
     Returns:
         dict: Crop information
     """
-    crop_info = {
-        'rice': {
-            'description': 'Rice is a cereal grain and the most important staple food for a large part of the world population.',
-            'optimal_temp': '20-35°C',
-            'optimal_ph': '5.5-6.5',
-            'water_requirement': 'High',
-            'season': 'Monsoon'
-        },
-        'wheat': {
-            'description': 'Wheat is a cereal grain that is a worldwide staple food.',
-            'optimal_temp': '15-25°C',
-            'optimal_ph': '6.0-7.5',
-            'water_requirement': 'Medium',
-            'season': 'Winter'
-        },
-        'maize': {
-            'description': 'Maize, also known as corn, is a cereal grain first domesticated by indigenous peoples in Mexico.',
-            'optimal_temp': '18-32°C',
-            'optimal_ph': '5.5-7.5',
-            'water_requirement': 'High',
-            'season': 'Summer'
-        },
-        'cotton': {
-            'description': 'Cotton is a soft, fluffy staple fiber that grows in a boll around the seeds of cotton plants.',
-            'optimal_temp': '25-35°C',
-            'optimal_ph': '5.5-8.5',
-            'water_requirement': 'Medium',
-            'season': 'Summer'
-        }
-    }
-    
-    return crop_info.get(crop_name.lower(), {
-        'description': 'Information not available for this crop.',
-        'optimal_temp': 'N/A',
-        'optimal_ph': 'N/A',
-        'water_requirement': 'N/A',
-        'season': 'N/A'
-    })
+    return dict(_CROP_DISPLAY.get(crop_name.lower(), _UNKNOWN_CROP_DISPLAY))